@@ -16,8 +16,15 @@ from urllib.parse import urljoin
 
 import requests
 from bravado.exception import HTTPError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from reana_client.api.utils import get_content_disposition_filename
-from reana_client.config import ERROR_MESSAGES
+from reana_client.config import (
+    DOWNLOAD_MAX_WORKERS,
+    ERROR_MESSAGES,
+    UPLOAD_BUFFER_SIZE,
+    UPLOAD_MAX_WORKERS,
+)
 from reana_client.errors import FileDeletionError, FileUploadError
 from reana_client.utils import is_regular_path, is_uuid_v4
 from reana_commons.api_client import get_current_api_client
@@ -35,6 +42,31 @@ current_rs_api_client = LocalProxy(
 )
 
 
+def _create_http_session():
+    """Create the HTTP session used to send requests to the REANA server.
+
+    The connection pool is big enough for all the concurrent uploads and
+    downloads to keep their own connection alive, and failed connection
+    attempts are retried.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_maxsize=max(UPLOAD_MAX_WORKERS, DOWNLOAD_MAX_WORKERS),
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+http_session = _create_http_session()
+"""HTTP session shared by the requests not sent through the OpenAPI client.
+
+Reusing the same session keeps the connections to the REANA server alive
+across calls, e.g. when uploading many files one after the other.
+"""
+
+
 def ping(access_token):
     """Check if the REANA server is reachable and the user is correctly authenticated.
 
@@ -407,7 +439,7 @@ def upload_file(workflow, file_, file_name, access_token):
         endpoint = current_rs_api_client.api.upload_file.operation.path_name.format(
             workflow_id_or_name=workflow
         )
-        http_response = requests.post(
+        http_response = http_session.post(
             urljoin(get_api_url(), endpoint),
             data=file_,
             params={"file_name": file_name, "access_token": access_token},
@@ -477,15 +509,20 @@ def get_workflow_logs(workflow, access_token, steps=None, page=None, size=None):
         raise e
 
 
-def download_file(workflow, file_name, access_token):
+def download_file(workflow, file_name, access_token, stream=False):
     """Download the requested file if it exists.
 
     :param workflow: name or id of the workflow.
     :param file_name: file name or path to the file requested.
     :param access_token: access token of the current user.
-
-    :return: a tuple containing file binary content, filename and whether
-        the returned file is a zip archive containing multiple files.
+    :param stream: whether to return the streamed HTTP response instead of
+        the whole file content, so that big files do not need to fit in memory.
+        The caller then reads the content, e.g. with ``iter_content()``, and
+        closes the response.
+
+    :return: a tuple containing file binary content (or the streamed HTTP
+        response, if ``stream`` is set), filename and whether the returned file
+        is a zip archive containing multiple files.
     """
     try:
         from reana_client.utils import get_api_url
@@ -494,31 +531,40 @@ def download_file(workflow, file_name, access_token):
         endpoint = current_rs_api_client.api.download_file.operation.path_name.format(
             workflow_id_or_name=workflow, file_name=file_name
         )
-        http_response = requests.get(
+        http_response = http_session.get(
             urljoin(get_api_url(), endpoint),
             params={"file_name": file_name, "access_token": access_token},
             verify=False,
+            stream=stream,
         )
-        if "Content-Disposition" in http_response.headers:
-            file_name = get_content_disposition_filename(
-                http_response.headers.get("Content-Disposition")
-            )
+        try:
+            if "Content-Disposition" in http_response.headers:
+                file_name = get_content_disposition_filename(
+                    http_response.headers.get("Content-Disposition")
+                )
 
-        # A zip archive is downloaded if multiple files are requested
-        multiple_files_zipped = (
-            http_response.headers.get("Content-Type") == "application/zip"
-        )
+            # A zip archive is downloaded if multiple files are requested
+            multiple_files_zipped = (
+                http_response.headers.get("Content-Type") == "application/zip"
+            )
 
-        if http_response.status_code == 200:
-            return http_response.content, file_name, multiple_files_zipped
-        else:
-            raise Exception(
-                "Error {status_code} {reason} {message}".format(
-                    status_code=http_response.status_code,
-                    reason=http_response.reason,
-                    message=http_response.json().get("message"),
+            if http_response.status_code != 200:
+                raise Exception(
+                    "Error {status_code} {reason} {message}".format(
+                        status_code=http_response.status_code,
+                        reason=http_response.reason,
+                        message=http_response.json().get("message"),
+                    )
                 )
-            )
+            if stream:
+                # the content is read, and the response closed, by the caller
+                return http_response, file_name, multiple_files_zipped
+            content = http_response.content
+        except Exception:
+            http_response.close()
+            raise
+        http_response.close()
+        return content, file_name, multiple_files_zipped
 
     except HTTPError as e:
         logging.debug(
@@ -662,19 +708,21 @@ def upload_to_server(workflow, paths, access_token):
         if os.path.isdir(path):
             logging.debug("'{}' is a directory.".format(path))
             logging.info("Uploading contents of folder '{}' ...".format(path))
-            for root, dirs, files in os.walk(path, topdown=False):
-                uploaded_files = []
-                for next_path in files + dirs:
-                    next_uploaded_files = upload_to_server(
-                        workflow, os.path.join(root, next_path), access_token
+            uploaded_files = []
+            # `os.walk` already descends into the subdirectories, so only the
+            # files of each directory need to be uploaded
+            for root, _, files in os.walk(path):
+                for next_path in files:
+                    uploaded_files.extend(
+                        upload_to_server(
+                            workflow, os.path.join(root, next_path), access_token
+                        )
                     )
-                    if next_uploaded_files:
-                        uploaded_files.extend(next_uploaded_files)
             return uploaded_files
 
         # Check if input is an absolute path and upload file.
         else:
-            with open(path, "rb") as f:
+            with open(path, "rb", buffering=UPLOAD_BUFFER_SIZE) as f:
                 fname = os.path.basename(f.name)
                 # Calculate the path that will store the file
                 # in the workflow controller, by subtracting
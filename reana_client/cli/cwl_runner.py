@@ -7,96 +7,178 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 """CWL v1.0 interface CLI implementation."""
 
-import io
+import functools
 import logging
 import os
 import re
 import sys
-import traceback
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 
 import click
 import yaml
-from bravado.exception import HTTPServerError
-from cwltool.load_tool import fetch_document
-from cwltool.main import printdeps
-
-from reana_commons.specification import load_workflow_spec
 
 from reana_client.cli.utils import add_access_token_options
+from reana_client.config import (
+    CWL_LOGS_POLL_MAX_INTERVAL,
+    CWL_LOGS_POLL_MIN_INTERVAL,
+    UPLOAD_BUFFER_SIZE,
+    UPLOAD_MAX_WORKERS,
+)
+from reana_client.errors import FileUploadError
 from reana_client.version import __version__
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    # PyYAML was built without libyaml bindings
+    from yaml import SafeLoader as YamlLoader
+
+LOGS_END_MARKERS = ("Final process status", "Traceback (most recent call last)")
+"""Workflow log lines signalling that the CWL workflow run is over."""
+
+FINAL_OUTPUT_REGEX = re.compile(r"FinalOutput([\s\S]*?)FinalOutput")
+"""Regular expression matching the CWL outputs printed in the workflow logs."""
 
-def findfiles(wo, fn=None):
-    """Return a list CWL workflow files."""
-    if fn is None:
-        fn = []
-    if isinstance(wo, dict):
-        if wo.get("class") == "File":
-            fn.append(wo)
-            findfiles(wo.get("secondaryFiles"), fn)
-        elif wo.get("class") == "Directory":
-            fn.append(wo)
-            findfiles(wo.get("secondaryFiles"), fn)
-        else:
-            for w in wo.values():
-                findfiles(w, fn)
-    elif isinstance(wo, list):
-        for w in wo:
-            findfiles(w, fn)
-    return fn
 
+def findfiles(wo):
+    """Yield the CWL workflow files, in the order they are declared."""
+    # walk the CWL object iteratively, pushing the children in reverse order
+    # so that files are returned in the same order as they are declared
+    nodes = [wo]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, dict):
+            if node.get("class") in ("File", "Directory"):
+                yield node
+                nodes.append(node.get("secondaryFiles"))
+            else:
+                nodes.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            nodes.extend(reversed(node))
 
-def get_file_dependencies_obj(cwl_obj, basedir):
+
+def get_file_dependencies_obj(cwl_obj, basedir, loading_context=None):
     """Return a dictionary which contains the CWL workflow file dependencies.
 
     :param cwl_obj: A CWL tool or job which might contain file dependencies.
     :param basedir: Workflow base dir.
+    :param loading_context: CWL loading context whose document loader, and
+        thus its cache of fetched documents, is reused between calls.
     :returns: A dictionary composed of valid CWL file dependencies.
     """
+    from cwltool.load_tool import fetch_document
+    from cwltool.main import find_deps, make_relative
+    from cwltool.utils import visit_class
+
     # Load the document
     # remove filename additions (e.g. 'v1.0/conflict-wf.cwl#collision')
     document = cwl_obj.split("#")[0]
-    document_loader, workflow_obj, uri = fetch_document(document)
-    in_memory_buffer = io.StringIO()
-    # Get dependencies
-    printdeps(
-        workflow_obj,
-        document_loader.loader,
-        in_memory_buffer,
-        "primary",
-        uri,
-        basedir=basedir,
+    document_loader, workflow_obj, uri = fetch_document(document, loading_context)
+    # Get dependencies, as ``cwltool --print-deps --relative-deps primary``
+    # would print them, without dumping them to JSON and parsing them back
+    file_dependencies_obj = find_deps(
+        workflow_obj, document_loader.loader, uri, basedir=basedir
     )
-    file_dependencies_obj = yaml.load(
-        in_memory_buffer.getvalue(), Loader=yaml.FullLoader
+    visit_class(
+        file_dependencies_obj,
+        ("File", "Directory"),
+        functools.partial(make_relative, basedir),
     )
-    in_memory_buffer.close()
     return file_dependencies_obj
 
 
-def upload_files(files, basedir, workflow_id, access_token):
-    """Upload file or directory to REANA server."""
-    from reana_client.api.client import upload_file
+def get_files_to_upload(files, basedir):
+    """Return the local and workspace paths of the CWL files to upload.
+
+    Directories are expanded into all the files they contain, and files which
+    are referenced several times are only returned once.
 
+    :param files: List of CWL ``File`` and ``Directory`` objects.
+    :param basedir: Workflow base dir.
+    :returns: Generator of ``(absolute path, workspace path)`` tuples.
+    """
+    # the workspace path determines the local one, so it identifies a file
+    seen = set()
+    # all the walked paths start with the base dir, which is stripped from them
+    basedir_length = len(os.path.join(basedir, ""))
     for cwl_file_object in files:
         file_path = cwl_file_object.get("location")
         abs_file_path = os.path.join(basedir, file_path)
 
         if os.path.isdir(abs_file_path):
-            for root, dirs, files in os.walk(abs_file_path, topdown=False):
-                for next_path in files + dirs:
-                    location = os.path.join(root, next_path).replace(basedir + "/", "")
-                    upload_files(
-                        [{"location": location}],
-                        basedir,
-                        workflow_id,
-                        access_token,
-                    )
+            for root, _, dir_files in os.walk(abs_file_path):
+                workspace_root = os.path.join(root, "")[basedir_length:]
+                for name in dir_files:
+                    workspace_path = workspace_root + name
+                    if workspace_path not in seen:
+                        seen.add(workspace_path)
+                        yield os.path.join(root, name), workspace_path
+        elif file_path not in seen:
+            seen.add(file_path)
+            yield abs_file_path, file_path
+
+
+def upload_files(files, basedir, workflow_id, access_token):
+    """Upload file or directory to REANA server.
+
+    All the files are uploaded even if some of them fail, which are then reported
+    together by raising ``FileUploadError``.
+    """
+    from reana_client.api.client import upload_file
+
+    def _upload(abs_file_path, file_path):
+        with open(abs_file_path, "rb", buffering=UPLOAD_BUFFER_SIZE) as f:
+            upload_file(workflow_id, f, file_path, access_token)
+            logging.error("File {} uploaded.".format(file_path))
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+        futures = [
+            (file_path, executor.submit(_upload, abs_file_path, file_path))
+            for abs_file_path, file_path in get_files_to_upload(files, basedir)
+        ]
+        # wait for all the uploads, so that every failed one is reported
+        failed_files = []
+        for file_path, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logging.error("File {} could not be uploaded: {}".format(file_path, e))
+                failed_files.append(file_path)
+    if failed_files:
+        raise FileUploadError(
+            "Files could not be uploaded: {}".format(", ".join(failed_files))
+        )
+
+
+def wait_for_workflow_logs(workflow_id, access_token):
+    """Poll the workflow logs, printing them, until the CWL workflow run is over.
+
+    :param workflow_id: UUID of the workflow.
+    :param access_token: Access token of the current user.
+    :returns: The complete workflow logs.
+    """
+    from reana_client.api.client import get_workflow_logs
+
+    logs_offset = 0
+    poll_interval = CWL_LOGS_POLL_MIN_INTERVAL
+    while True:
+        sleep(poll_interval)
+        logging.error("Polling workflow logs")
+        response = get_workflow_logs(workflow_id, access_token)
+        logs = response["logs"]
+        if len(logs) > logs_offset:
+            logging.error(logs[logs_offset:])
+            logs_offset = len(logs)
+            poll_interval = CWL_LOGS_POLL_MIN_INTERVAL
+            # the logs are serialised as JSON, with the workflow logs before the
+            # job logs, so new workflow log lines are not at the end of them
+            if any(marker in logs for marker in LOGS_END_MARKERS):
+                break
         else:
-            with open(abs_file_path, "r") as f:
-                upload_file(workflow_id, f, file_path, access_token)
-                logging.error("File {} uploaded.".format(file_path))
+            # back off while the workflow does not produce new logs
+            poll_interval = min(poll_interval * 2, CWL_LOGS_POLL_MAX_INTERVAL)
+    return logs
 
 
 @click.command()
@@ -114,27 +196,33 @@ def upload_files(files, basedir, workflow_id, access_token):
 @click.pass_context
 def cwl_runner(ctx, quiet, outdir, basedir, processfile, jobfile, access_token):
     """Run CWL files in a standard format <workflow.cwl> <job.json>."""
-    import json
+    from cwltool.context import LoadingContext
+    from cwltool.load_tool import default_loader
+    from reana_commons.specification import load_workflow_spec
     from reana_client.utils import get_api_url
     from reana_client.api.client import (
         create_workflow,
-        get_workflow_logs,
         start_workflow,
         upload_file,
     )
 
-    logging.basicConfig(
-        format="[%(levelname)s] %(message)s",
-        stream=sys.stderr,
-        level=logging.INFO if quiet else logging.DEBUG,
-    )
+    log_level = logging.INFO if quiet else logging.DEBUG
+    if logging.getLogger().handlers:
+        # logging was already configured by the caller, only switch the level
+        logging.getLogger().setLevel(log_level)
+    else:
+        logging.basicConfig(
+            format="[%(levelname)s] %(message)s",
+            stream=sys.stderr,
+            level=log_level,
+        )
     try:
         basedir = basedir or os.path.abspath(os.path.dirname(processfile))
         reana_spec = {"workflow": {"type": "cwl"}}
         job = {}
         if jobfile:
             with open(jobfile) as f:
-                job = yaml.load(f, Loader=yaml.FullLoader)
+                job = yaml.load(f, Loader=YamlLoader)
 
         if processfile:
             reana_spec["inputs"] = {"parameters": job}
@@ -145,8 +233,7 @@ def cwl_runner(ctx, quiet, outdir, basedir, processfile, jobfile, access_token):
             reana_spec["workflow"]["specification"]
         )
         logging.info("Connecting to {0}".format(get_api_url()))
-        reana_specification = json.loads(json.dumps(reana_spec, sort_keys=True))
-        response = create_workflow(reana_specification, "cwl-test", access_token)
+        response = create_workflow(reana_spec, "cwl-test", access_token)
         logging.error(response)
         workflow_name = response["workflow_name"]
         workflow_id = response["workflow_id"]
@@ -154,10 +241,15 @@ def cwl_runner(ctx, quiet, outdir, basedir, processfile, jobfile, access_token):
             "Workflow {0}/{1} has been created.".format(workflow_name, workflow_id)
         )
         file_dependencies_list = []
+        # share the document loader between the workflow and the job file
+        loading_context = LoadingContext()
+        loading_context.loader = default_loader()
         for cwlobj in [processfile, jobfile]:
             if not cwlobj:
                 continue
-            file_dependencies_obj = get_file_dependencies_obj(cwlobj, basedir)
+            file_dependencies_obj = get_file_dependencies_obj(
+                cwlobj, basedir, loading_context
+            )
             file_dependencies_list.append(file_dependencies_obj)
         files_to_upload = findfiles(file_dependencies_list)
         upload_files(files_to_upload, basedir, workflow_id, access_token)
@@ -166,46 +258,22 @@ def cwl_runner(ctx, quiet, outdir, basedir, processfile, jobfile, access_token):
         )
         logging.error(response)
 
-        first_logs = ""
-        while True:
-            sleep(1)
-            logging.error("Polling workflow logs")
-            response = get_workflow_logs(workflow_id, access_token)
-            logs = response["logs"]
-            if logs != first_logs:
-                logging.error(logs[len(first_logs) :])
-                first_logs = logs
-
-            if (
-                "Final process status" in logs
-                or "Traceback (most recent call last)" in logs
-            ):
-                # click.echo(response['status'])
-                break
+        logs = wait_for_workflow_logs(workflow_id, access_token)
         try:
-            import ast
-
-            out = (
-                re.search(r"FinalOutput[\s\S]*?FinalOutput", logs)
-                .group()
-                .replace("FinalOutput", "")
-            )
+            out = FINAL_OUTPUT_REGEX.search(logs).group(1)
             json_output = out.encode("utf8").decode("unicode_escape")
         except AttributeError:
             logging.error("Workflow execution failed")
             sys.exit(1)
         except Exception:
-            logging.error(traceback.format_exc())
+            logging.exception("Workflow outputs could not be parsed.")
             sys.exit(1)
         sys.stdout.write(json_output)
         sys.stdout.write("\n")
         sys.stdout.flush()
 
-    except HTTPServerError as e:
-        logging.error(traceback.print_exc())
-        logging.error(e)
-    except Exception:
-        logging.error(traceback.print_exc())
+    except Exception as e:
+        logging.exception(e)
 
 
 def replace_location_in_cwl_spec(spec):
@@ -229,35 +297,22 @@ def replace_location_in_cwl_spec(spec):
 def replace_location_in_cwl_tool(spec):
     """Recursively replace absolute paths with relative."""
     # tools
-    inputs_parameters = []
     for param in spec["inputs"]:
         if param["type"] == "File":
-            if param.get("default", ""):
-                location = "location" if param["default"].get("location") else "path"
-                param["default"][location] = param["default"][location].split("/")[-1]
-        inputs_parameters.append(param)
-    spec["inputs"] = inputs_parameters
+            default = param.get("default")
+            if default:
+                location = "location" if default.get("location") else "path"
+                default[location] = default[location].rpartition("/")[2]
     # workflows
-    if spec.get("steps"):
-        steps = []
-        for tool in spec["steps"]:
-            tool_inputs = []
-            for param in tool["in"]:
-                if param.get("default") and type(param["default"]) is dict:
-                    if (
-                        param["default"].get("class", param["default"].get("type"))
-                        == "File"
-                    ):
-                        location = (
-                            "location" if param["default"].get("location") else "path"
-                        )
-                        param["default"][location] = param["default"][location].split(
-                            "/"
-                        )[-1]
-                tool_inputs.append(param)
-            tool["in"] = tool_inputs
-            steps.append(tool)
-        spec["steps"] = steps
+    for tool in spec.get("steps") or []:
+        for param in tool["in"]:
+            default = param.get("default")
+            if (
+                isinstance(default, dict)
+                and default.get("class", default.get("type")) == "File"
+            ):
+                location = "location" if default.get("location") else "path"
+                default[location] = default[location].rpartition("/")[2]
     return spec
 
 
@@ -7,13 +7,17 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 """REANA client output related commands."""
 
+import contextlib
+import glob
 import io
 import logging
 import os
 import sys
-import traceback
+import uuid
 import zipfile
-from typing import List, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 
 import click
 import pathspec
@@ -29,15 +33,45 @@ from reana_client.cli.utils import (
     check_connection,
     display_formatted_output,
     human_readable_or_raw_option,
+    log_command_parameters,
     parse_filter_parameters,
 )
-from reana_client.config import JSON, STD_OUTPUT_CHAR, URL
+from reana_client.config import (
+    DELETE_MAX_WORKERS,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_MAX_WORKERS,
+    JSON,
+    STD_OUTPUT_CHAR,
+    UPLOAD_MAX_WORKERS,
+    URL,
+)
 from reana_client.errors import FileDeletionError
 from reana_client.utils import is_regular_path
 
 FILES_BLACKLIST = (".git/", "/.git/")
 
 
+def _get_file_size(path: str) -> int:
+    """Return the size of a file, or 0 if it cannot be accessed."""
+    try:
+        return os.lstat(path).st_size
+    except OSError:
+        # the error is reported when the file is uploaded
+        return 0
+
+
+def _patterns_may_overlap(patterns: List[str]) -> bool:
+    """Return whether some of the given workspace patterns may match the same files."""
+    paths = [os.path.normpath(pattern) for pattern in patterns]
+    if len(paths) > 1 and any(glob.has_magic(path) for path in paths):
+        return True
+    return any(
+        path == other or other.startswith(path.rstrip(os.sep) + os.sep)
+        for i, path in enumerate(paths)
+        for other in paths[i + 1 :] + paths[:i]
+    )
+
+
 @click.group(help="Workspace file management commands")
 @click.pass_context
 def files_group(ctx):
@@ -112,53 +146,50 @@ def get_files(
     """  # noqa: W605
     from reana_client.api.client import current_rs_api_client, list_files
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     search_filter = None
     headers = ["name", "size", "last-modified"]
     if filters:
         _, search_filter = parse_filter_parameters(filters, headers)
     if workflow:
-        logging.info('Workflow "{}" selected'.format(workflow))
+        logging.info('Workflow "%s" selected', workflow)
         try:
             response = list_files(
                 workflow, access_token, filename, page, size, search_filter
             )
-            data = []
-            file_path = get_path_from_operation_id(
-                current_rs_api_client.swagger_spec.spec_dict["paths"], "download_file"
-            )
-            urls = []
-            for file_ in response:
-                if not file_["name"].startswith(FILES_BLACKLIST):
-                    data.append(
-                        list(
-                            map(
-                                str,
-                                [
-                                    file_["name"],
-                                    file_["size"][human_readable_or_raw],
-                                    file_["last-modified"],
-                                ],
-                            )
-                        )
-                    )
-                    urls.append(
-                        ctx.obj.reana_server_url
-                        + file_path.format(
-                            workflow_id_or_name=workflow, file_name=file_["name"]
-                        )
-                    )
+            files = [
+                file_
+                for file_ in response
+                if not file_["name"].startswith(FILES_BLACKLIST)
+            ]
             if output_format == URL:
+                file_path = get_path_from_operation_id(
+                    current_rs_api_client.swagger_spec.spec_dict["paths"],
+                    "download_file",
+                )
+                urls = [
+                    ctx.obj.reana_server_url
+                    + file_path.format(
+                        workflow_id_or_name=workflow, file_name=file_["name"]
+                    )
+                    for file_ in files
+                ]
                 display_message("\n".join(urls))
             else:
+                # only the raw size is not already a string
+                data = [
+                    [
+                        file_["name"],
+                        str(file_["size"][human_readable_or_raw]),
+                        file_["last-modified"],
+                    ]
+                    for file_ in files
+                ]
                 display_formatted_output(data, headers, _format, output_format)
 
         except Exception as e:
-            logging.debug(traceback.format_exc())
-            logging.debug(str(e))
+            logging.debug(str(e), exc_info=True)
 
             display_message(
                 "Something went wrong while retrieving file list"
@@ -196,6 +227,8 @@ def download_files(
     \t $ reana-client download mydata.tmp outputs/myplot.png\n
     \t $ reana-client download -o - data.txt # write data.txt to stdout
     """
+    from requests.exceptions import RequestException
+
     from reana_client.api.client import download_file, get_workflow_specification
 
     def display_files_content(binary_file: bytes, multiple_files_zipped: bool) -> None:
@@ -213,9 +246,7 @@ def download_files(
         else:
             click.echo(binary_file, nl=False)
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     if not filenames:
         try:
@@ -235,49 +266,104 @@ def download_files(
             filenames += reana_spec["outputs"].get("files") or []
             filenames += reana_spec["outputs"].get("directories") or []
 
-    if workflow:
-        download_failed = False
-        for file_name in filenames:
-            try:
-                binary_file, file_name, multiple_files_zipped = download_file(
-                    workflow, file_name, access_token
-                )
+    def download(file_name: str) -> Tuple[str, Optional[bytes], bool]:
+        """Download a file, writing it to disk unless it goes to the standard output.
 
-                logging.info(
-                    "{0} binary file downloaded ... writing to {1}".format(
-                        file_name, output_directory
-                    )
-                )
+        :param file_name: Name of the file or directory to download.
+        :return: The name of the downloaded file, its content if it is to be
+            written to the standard output, and whether it is a zip archive.
+        """
+        # the standard output needs the whole content to extract zip archives
+        stream = output_directory != STD_OUTPUT_CHAR
+        content, file_name, multiple_files_zipped = download_file(
+            workflow, file_name, access_token, stream
+        )
+        if not stream:
+            logging.info(
+                "%s binary file downloaded ... writing to %s",
+                file_name,
+                output_directory,
+            )
+            return file_name, content, multiple_files_zipped
 
-                if output_directory == STD_OUTPUT_CHAR:
-                    display_files_content(binary_file, multiple_files_zipped)
-                else:
-                    outputs_file_path = os.path.join(output_directory, file_name)
-                    if not os.path.exists(os.path.dirname(outputs_file_path)):
-                        os.makedirs(os.path.dirname(outputs_file_path))
+        # the content is the streamed HTTP response, closed once written
+        try:
+            outputs_file_path = os.path.join(output_directory, file_name)
+            outputs_directory = os.path.dirname(outputs_file_path)
+            os.makedirs(outputs_directory, exist_ok=True)
+            # write to a temporary file which replaces the output file only when
+            # complete, so that an interrupted download leaves no truncated file
+            partial_file_path = os.path.join(
+                outputs_directory,
+                ".{}.{}.part".format(os.path.basename(file_name), uuid.uuid4().hex),
+            )
+            try:
+                with open(partial_file_path, "xb") as f:
+                    for chunk in content.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                os.replace(partial_file_path, outputs_file_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(partial_file_path)
+                raise
+            logging.info(
+                "%s binary file downloaded ... written to %s",
+                file_name,
+                output_directory,
+            )
+        finally:
+            content.close()
+        return file_name, None, multiple_files_zipped
 
-                    with open(outputs_file_path, "wb") as f:
-                        f.write(binary_file)
-                    display_message(
-                        f"File {file_name} downloaded to {output_directory}.",
-                        msg_type="success",
-                    )
-            except OSError as e:
-                logging.debug(traceback.format_exc())
-                logging.debug(str(e))
-                display_message(
-                    "File {0} could not be written.".format(file_name),
-                    msg_type="error",
-                )
-                download_failed = True
-            except Exception as e:
-                logging.debug(traceback.format_exc())
-                logging.debug(str(e))
+    def report_download(file_name: str, future: Future) -> bool:
+        """Report the result of a download, returning whether it failed."""
+        try:
+            file_name, binary_file, multiple_files_zipped = future.result()
+            if output_directory == STD_OUTPUT_CHAR:
+                display_files_content(binary_file, multiple_files_zipped)
+            else:
                 display_message(
-                    "File {0} could not be downloaded: {1}".format(file_name, e),
-                    msg_type="error",
+                    f"File {file_name} downloaded to {output_directory}.",
+                    msg_type="success",
                 )
-                download_failed = True
+        except RequestException as e:
+            # raised while streaming the content, and also an OSError
+            logging.debug(str(e), exc_info=True)
+            display_message(
+                "File {0} could not be downloaded: {1}".format(file_name, e),
+                msg_type="error",
+            )
+            return True
+        except OSError as e:
+            logging.debug(str(e), exc_info=True)
+            display_message(
+                "File {0} could not be written.".format(file_name),
+                msg_type="error",
+            )
+            return True
+        except Exception as e:
+            logging.debug(str(e), exc_info=True)
+            display_message(
+                "File {0} could not be downloaded: {1}".format(file_name, e),
+                msg_type="error",
+            )
+            return True
+        return False
+
+    if workflow:
+        download_failed = False
+        # files are downloaded concurrently, but reported in the requested order
+        # so that the output, and the content written to stdout, stay ordered;
+        # only as many downloads as workers are pending at any time, so that
+        # only their content is held in memory when writing to stdout
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_MAX_WORKERS) as executor:
+            pending = deque()
+            for file_name in filenames:
+                pending.append((file_name, executor.submit(download, file_name)))
+                if len(pending) == DOWNLOAD_MAX_WORKERS:
+                    download_failed |= report_download(*pending.popleft())
+            while pending:
+                download_failed |= report_download(*pending.popleft())
         if download_failed:
             sys.exit(1)
 
@@ -310,9 +396,7 @@ def upload_files(  # noqa: C901
     """
     from reana_client.api.client import get_workflow_specification, upload_to_server
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     if not filenames:
         try:
@@ -405,37 +489,45 @@ def upload_files(  # noqa: C901
                 filepaths.update([os.path.join(root, file) for file in files])
 
     upload_failed = False
-    for filename in filepaths:
-        try:
+    # files are uploaded concurrently, as the upload time is dominated by the
+    # round trips to the server rather than by the transfer of the content
+    with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+        futures = {}
+        # submit the largest files first, so that they do not end up being
+        # uploaded on their own after all the smaller ones are done
+        for filename in sorted(filepaths, key=_get_file_size, reverse=True):
             if not is_regular_path(filename):
-                display_message(f"Ignoring symlink {filepath}", msg_type="info")
+                display_message(f"Ignoring symlink {filename}", msg_type="info")
                 continue
-
             filepath = os.path.abspath(filename)
-            response = upload_to_server(workflow, filepath, access_token)
-            for file_ in response:
+            future = executor.submit(upload_to_server, workflow, filepath, access_token)
+            futures[future] = filename
+
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                response = future.result()
+                for file_ in response:
+                    display_message(
+                        "File {} was successfully uploaded.".format(file_),
+                        msg_type="success",
+                    )
+            except FileNotFoundError as e:
+                logging.debug(str(e), exc_info=True)
                 display_message(
-                    "File {} was successfully uploaded.".format(file_),
-                    msg_type="success",
+                    "File {0} could not be uploaded: "
+                    "{0} does not exist.".format(filename),
+                    msg_type="error",
                 )
-        except FileNotFoundError as e:
-            logging.debug(traceback.format_exc())
-            logging.debug(str(e))
-            display_message(
-                "File {0} could not be uploaded: "
-                "{0} does not exist.".format(filename),
-                msg_type="error",
-            )
-            upload_failed = True
-        except Exception as e:
-            logging.debug(traceback.format_exc())
-            logging.debug(str(e))
-            display_message(
-                "Something went wrong while uploading {}: \n"
-                "{}".format(filename, str(e)),
-                msg_type="error",
-            )
-            upload_failed = True
+                upload_failed = True
+            except Exception as e:
+                logging.debug(str(e), exc_info=True)
+                display_message(
+                    "Something went wrong while uploading {}: \n"
+                    "{}".format(filename, str(e)),
+                    msg_type="error",
+                )
+                upload_failed = True
     if upload_failed:
         sys.exit(1)
 
@@ -458,43 +550,54 @@ def delete_files(ctx, workflow, filenames, access_token):  # noqa: D301
     """  # noqa: W605
     from reana_client.api.client import delete_file
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     if workflow:
         delete_failed = False
-        for filename in filenames:
-            try:
-                response = delete_file(workflow, filename, access_token)
-                freed_space = 0
-                for file_ in response["deleted"]:
-                    freed_space += response["deleted"][file_]["size"]
-                    display_message(
-                        f"File {file_} was successfully deleted.", msg_type="success"
-                    )
-                for file_ in response["failed"]:
+        # deletions are requested concurrently, but handled in the given order
+        # so that the output stays the same as when deleting one after the other;
+        # patterns that may match the same files are deleted one after the other,
+        # as otherwise which of them reports the files as not found is random
+        max_workers = 1 if _patterns_may_overlap(filenames) else DELETE_MAX_WORKERS
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (
+                    filename,
+                    executor.submit(delete_file, workflow, filename, access_token),
+                )
+                for filename in filenames
+            ]
+            for filename, future in futures:
+                try:
+                    response = future.result()
+                    freed_space = 0
+                    for file_ in response["deleted"]:
+                        freed_space += response["deleted"][file_]["size"]
+                        display_message(
+                            f"File {file_} was successfully deleted.",
+                            msg_type="success",
+                        )
+                    for file_ in response["failed"]:
+                        display_message(
+                            "Something went wrong while deleting {}.\n"
+                            "{}".format(file_, response["failed"][file_]["error"]),
+                            msg_type="error",
+                        )
+                        delete_failed = True
+                    if freed_space:
+                        display_message(
+                            f"{freed_space} bytes freed up.", msg_type="success"
+                        )
+                except FileDeletionError as e:
+                    display_message(str(e), msg_type="error")
+                    delete_failed = True
+                except Exception as e:
+                    logging.debug(str(e), exc_info=True)
                     display_message(
-                        "Something went wrong while deleting {}.\n"
-                        "{}".format(file_, response["failed"][file_]["error"]),
+                        "Something went wrong while deleting {}".format(filename),
                         msg_type="error",
                     )
                     delete_failed = True
-                if freed_space:
-                    display_message(
-                        f"{freed_space} bytes freed up.", msg_type="success"
-                    )
-            except FileDeletionError as e:
-                display_message(str(e), msg_type="error")
-                delete_failed = True
-            except Exception as e:
-                logging.debug(traceback.format_exc())
-                logging.debug(str(e))
-                display_message(
-                    "Something went wrong while deleting {}".format(filename),
-                    msg_type="error",
-                )
-                delete_failed = True
         if delete_failed:
             sys.exit(1)
 
@@ -515,11 +618,9 @@ def move_files(ctx, source, target, workflow, access_token):  # noqa: D301
     Examples:\n
     \t $ reana-client mv data/input.txt input/input.txt
     """
-    from reana_client.api.client import get_workflow_status, list_files, mv_files
+    from reana_client.api.client import mv_files
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     try:
         mv_files(source, target, workflow, access_token)
@@ -528,8 +629,7 @@ def move_files(ctx, source, target, workflow, access_token):  # noqa: D301
             msg_type="success",
         )
     except Exception as e:
-        logging.debug(traceback.format_exc())
-        logging.debug(str(e))
+        logging.debug(str(e), exc_info=True)
         display_message("Something went wrong. {}".format(e), msg_type="error")
         sys.exit(1)
 
@@ -565,9 +665,7 @@ def prune_files(
     """
     from reana_client.api.client import prune_workspace
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     try:
         response = prune_workspace(
@@ -575,8 +673,7 @@ def prune_files(
         )
         display_message(response["message"], msg_type="success")
     except Exception as e:
-        logging.debug(traceback.format_exc())
-        logging.debug(str(e))
+        logging.debug(str(e), exc_info=True)
         display_message(
             "Workspace could not be pruned: \n{}".format(e),
             msg_type="error",
@@ -614,9 +711,7 @@ def workflow_disk_usage(
     """
     from reana_client.api.client import get_workflow_disk_usage
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     search_filter = None
     headers = ["size", "name"]
@@ -640,8 +735,7 @@ def workflow_disk_usage(
                     )
             click_table_printer(headers, [], data)
         except Exception as e:
-            logging.debug(traceback.format_exc())
-            logging.debug(str(e))
+            logging.debug(str(e), exc_info=True)
             display_message(
                 "Disk usage could not be retrieved: \n{}".format(e),
                 msg_type="error",
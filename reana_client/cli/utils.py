@@ -9,6 +9,7 @@
 
 import functools
 import json
+import logging
 import os
 import shlex
 import sys
@@ -16,7 +17,6 @@ import time
 from typing import Callable, NoReturn, Optional, List, Tuple, Union
 
 import click
-import tablib
 
 from reana_commons.utils import click_table_printer
 
@@ -92,6 +92,15 @@ def access_token_check(
         return access_token
 
 
+def log_command_parameters(ctx: click.core.Context) -> None:
+    """Log the invoked command and its parameters, if debug logging is enabled."""
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    logging.debug("command: %s", ctx.command_path.replace(" ", "."))
+    for p in ctx.params:
+        logging.debug("%s: %s", p, ctx.params[p])
+
+
 def check_connection(func):
     """Check if connected to any REANA cluster."""
 
@@ -243,13 +252,10 @@ def display_formatted_output(
     output_format: Optional[str],
 ) -> None:
     """Format and display output data."""
-    tablib_data = tablib.Dataset()
-    tablib_data.headers = headers
-
-    for row in data:
-        tablib_data.append(row=row, tags=row)
-
     if _format:
+        import tablib
+
+        tablib_data = tablib.Dataset(*data, headers=headers)
         parsed_format_filters = parse_format_parameters(_format)
         tablib_data, filtered_headers = format_data(
             parsed_format_filters, headers, tablib_data
@@ -261,7 +267,8 @@ def display_formatted_output(
             click_table_printer(filtered_headers, filtered_headers, tablib_data)
     else:
         if output_format == JSON:
-            display_message(tablib_data.export(output_format))
+            # same output as exporting a tablib dataset, without building it
+            display_message(json.dumps([dict(zip(headers, row)) for row in data]))
         else:
             click_table_printer(headers, _format, data)
 
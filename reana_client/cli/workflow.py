@@ -29,6 +29,7 @@ from reana_client.cli.utils import (
     get_formatted_progress,
     human_readable_or_raw_option,
     key_value_to_dict,
+    log_command_parameters,
     parse_filter_parameters,
     requires_environments,
     retrieve_workflow_logs,
@@ -241,9 +242,7 @@ def workflows_list(  # noqa: C901
         )
         sys.exit(1)
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
     type = "interactive" if sessions else "batch"
 
     status_filter = RUN_STATUSES.copy()
@@ -433,9 +432,7 @@ def workflow_create(ctx, file, name, skip_validation, access_token):  # noqa: D3
     from reana_client.api.client import create_workflow
     from reana_client.utils import get_api_url
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     # Check that name is not an UUIDv4.
     # Otherwise it would mess up `--workflow` flag usage because no distinction
@@ -542,9 +539,7 @@ def workflow_start(
         else:
             display_message(status_msg, msg_type="success")
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     parsed_parameters = {"input_parameters": parameters, "operational_options": options}
     if workflow:
@@ -668,9 +663,7 @@ def workflow_restart(
     )
     from reana_client.utils import get_api_url
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     parsed_parameters = {
         "input_parameters": parameters,
@@ -852,9 +845,7 @@ def workflow_status(  # noqa: C901
                 data[-1] += [response.get(k)]
         return data
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
     try:
         workflow_response = get_workflow_status(workflow, access_token)
         headers = ["name", "run_number", "created", "status"]
@@ -931,9 +922,7 @@ def workflow_logs(
     \t $ reana-client logs -w myanalysis.42 --filter status=running\n
     \t $ reana-client logs -w myanalysis.42 --filter step=myfit --follow\n
     """
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     if json_format and follow:
         display_message(
@@ -1068,9 +1057,7 @@ def workflow_validate(
         else:
             display_message(ERROR_MESSAGES["missing_access_token"], msg_type="error")
             ctx.exit(1)
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
     try:
         load_validate_reana_spec(
             click.format_filename(file),
@@ -1290,9 +1277,7 @@ def workflow_delete(
 
     should_delete_workspace = True
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     if workflow:
         try:
@@ -1357,9 +1342,7 @@ def workflow_diff(
     """
     from reana_client.api.client import diff_workflows
 
-    logging.debug("command: {}".format(ctx.command_path.replace(" ", ".")))
-    for p in ctx.params:
-        logging.debug("{param}: {value}".format(param=p, value=ctx.params[p]))
+    log_command_parameters(ctx)
 
     def print_color_diff(lines):
         for line in lines:
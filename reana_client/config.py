@@ -83,3 +83,24 @@ CLI_LOGS_FOLLOW_MIN_INTERVAL = 1
 
 CLI_LOGS_FOLLOW_DEFAULT_INTERVAL = 10
 """Default interval between log requests in seconds."""
+
+CWL_LOGS_POLL_MIN_INTERVAL = 1
+"""Minimum interval between log requests of the CWL runner in seconds."""
+
+CWL_LOGS_POLL_MAX_INTERVAL = 15
+"""Maximum interval between log requests of the CWL runner in seconds."""
+
+UPLOAD_MAX_WORKERS = 8
+"""Maximum number of files uploaded concurrently to the workspace."""
+
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+"""Size in bytes of the read buffer of the files uploaded to the workspace."""
+
+DOWNLOAD_MAX_WORKERS = 8
+"""Maximum number of files downloaded concurrently from the workspace."""
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+"""Size in bytes of the chunks in which downloaded files are written to disk."""
+
+DELETE_MAX_WORKERS = 8
+"""Maximum number of workspace deletion requests sent concurrently."""
@@ -8,6 +8,8 @@
 
 """reana-client output print configuration."""
 
+from functools import lru_cache
+
 import click
 
 from reana_client.config import (
@@ -18,6 +20,29 @@ from reana_client.config import (
 )
 
 
+MSG_COLOR_MAP = {
+    "success": PRINTER_COLOUR_SUCCESS,
+    "warning": PRINTER_COLOUR_WARNING,
+    "error": PRINTER_COLOUR_ERROR,
+    "info": PRINTER_COLOUR_INFO,
+}
+"""Colour of the message prefix for each message type."""
+
+
+@lru_cache(maxsize=None)
+def _get_message_prefix(msg_type, indented):
+    """Return the styled prefix of a message, computing it only once per type."""
+    msg_color = MSG_COLOR_MAP.get(msg_type, "")
+    if msg_type == "info":
+        if indented:
+            return click.style(
+                "  -> {}: ".format(msg_type.upper()), bold=True, fg=msg_color
+            )
+        return click.style("==> ", bold=True)
+    prefix_tpl = "  -> {}: " if indented else "==> {}: "
+    return click.style(prefix_tpl.format(msg_type.upper()), bold=True, fg=msg_color)
+
+
 def display_message(msg, msg_type=None, indented=False):
     """Display messages in console.
 
@@ -28,35 +53,15 @@ def display_message(msg, msg_type=None, indented=False):
     :type msg_type: str
     :type indented: bool
     """
-    msg_color_map = {
-        "success": PRINTER_COLOUR_SUCCESS,
-        "warning": PRINTER_COLOUR_WARNING,
-        "error": PRINTER_COLOUR_ERROR,
-        "info": PRINTER_COLOUR_INFO,
-    }
-    msg_color = msg_color_map.get(msg_type, "")
-
     if msg_type == "info":
+        click.echo(_get_message_prefix(msg_type, indented), nl=False)
         if indented:
-            click.secho(
-                "  -> {}: ".format(msg_type.upper()),
-                bold=True,
-                nl=False,
-                fg=msg_color,
-            )
             click.secho("{}".format(msg), nl=True)
         else:
-            click.secho("==> ", bold=True, nl=False)
             click.secho("{}".format(msg), bold=True, nl=True)
     elif msg_type in ["error", "warning", "success"]:
-        prefix_tpl = "  -> {}: " if indented else "==> {}: "
-        click.secho(
-            prefix_tpl.format(msg_type.upper()),
-            bold=True,
-            nl=False,
-            err=msg_type == "error",
-            fg=msg_color,
-        )
-        click.secho("{}".format(msg), bold=False, err=msg_type == "error", nl=True)
+        err = msg_type == "error"
+        click.echo(_get_message_prefix(msg_type, indented), nl=False, err=err)
+        click.secho("{}".format(msg), bold=False, err=err, nl=True)
     else:
         click.secho("{}".format(msg), nl=True)
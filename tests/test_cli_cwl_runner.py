@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of REANA.
+# Copyright (C) 2024 CERN.
+#
+# REANA is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""REANA client CWL runner tests."""
+
+import json
+import os
+
+import pytest
+from mock import call, patch
+
+from reana_client.cli.cwl_runner import (
+    findfiles,
+    get_files_to_upload,
+    replace_location_in_cwl_tool,
+    upload_files,
+    wait_for_workflow_logs,
+)
+from reana_client.errors import FileUploadError
+
+
+def test_findfiles():
+    """Test finding nested CWL files and directories in declaration order."""
+    secondary_file = {"class": "File", "location": "input.txt.idx"}
+    input_file = {
+        "class": "File",
+        "location": "input.txt",
+        "secondaryFiles": [secondary_file],
+    }
+    directory = {"class": "Directory", "location": "data"}
+    code_file = {"class": "File", "location": "code/main.py"}
+    cwl_obj = [
+        {"inputs": {"input": input_file, "data": directory}},
+        {"steps": [{"in": [{"default": code_file}]}], "outputs": "result.txt"},
+    ]
+    assert list(findfiles(cwl_obj)) == [
+        input_file,
+        secondary_file,
+        directory,
+        code_file,
+    ]
+
+
+def test_get_files_to_upload(tmp_path):
+    """Test listing the files to upload once, expanding nested directories."""
+    basedir = str(tmp_path)
+    os.makedirs(os.path.join(basedir, "data", "nested"))
+    for path in ["input.txt", "data/a.txt", "data/nested/b.txt"]:
+        with open(os.path.join(basedir, path), "w") as f:
+            f.write("test")
+
+    files = [
+        {"class": "File", "location": "input.txt"},
+        {"class": "Directory", "location": "data"},
+        {"class": "File", "location": "input.txt"},
+        {"class": "File", "location": "data/a.txt"},
+    ]
+    uploads = list(get_files_to_upload(files, basedir))
+    assert sorted(file_path for _, file_path in uploads) == [
+        "data/a.txt",
+        "data/nested/b.txt",
+        "input.txt",
+    ]
+    for abs_file_path, file_path in uploads:
+        assert abs_file_path == os.path.join(basedir, file_path)
+
+
+def test_upload_files_failure(tmp_path, caplog):
+    """Test that a failed upload is reported after the other ones finish."""
+    basedir = str(tmp_path)
+    file_paths = ["a.txt", "b.txt", "c.txt", "d.txt"]
+    for path in file_paths:
+        with open(os.path.join(basedir, path), "w") as f:
+            f.write("test")
+
+    def upload_file(workflow_id, file_, file_name, access_token):
+        if file_name == "b.txt":
+            raise Exception("Connection reset.")
+
+    files = [{"class": "File", "location": path} for path in file_paths]
+    with patch(
+        "reana_client.api.client.upload_file", side_effect=upload_file
+    ) as mock_upload_file:
+        with pytest.raises(FileUploadError, match="b.txt"):
+            upload_files(files, basedir, "workflow-id", "000000")
+
+    uploaded_files = sorted(c.args[2] for c in mock_upload_file.call_args_list)
+    assert uploaded_files == file_paths
+    assert "File b.txt could not be uploaded: Connection reset." in caplog.text
+    for path in ["a.txt", "c.txt", "d.txt"]:
+        assert "File {} uploaded.".format(path) in caplog.text
+
+
+def test_replace_location_in_cwl_tool():
+    """Test replacing absolute paths of default files with relative ones."""
+    spec = {
+        "inputs": [
+            {
+                "id": "input",
+                "type": "File",
+                "default": {"class": "File", "location": "/home/user/input.txt"},
+            },
+            {"id": "flag", "type": "boolean", "default": True},
+        ],
+        "steps": [
+            {
+                "in": [
+                    {"id": "code", "default": {"class": "File", "path": "code.py"}},
+                    {"id": "data", "default": {"type": "File", "path": "/data/x.csv"}},
+                    {"id": "name", "default": "/not/a/file"},
+                ]
+            }
+        ],
+    }
+    spec = replace_location_in_cwl_tool(spec)
+    assert spec["inputs"][0]["default"]["location"] == "input.txt"
+    assert spec["inputs"][1]["default"] is True
+    step_inputs = spec["steps"][0]["in"]
+    assert step_inputs[0]["default"]["path"] == "code.py"
+    assert step_inputs[1]["default"]["path"] == "x.csv"
+    assert step_inputs[2]["default"] == "/not/a/file"
+
+
+def _server_logs(workflow_logs, job_logs):
+    """Serialise the logs as the REANA server does."""
+    return json.dumps(
+        {
+            "workflow_logs": workflow_logs,
+            "job_logs": job_logs,
+            "engine_specific": None,
+        }
+    )
+
+
+@patch("reana_client.cli.cwl_runner.CWL_LOGS_POLL_MAX_INTERVAL", 15)
+@patch("reana_client.cli.cwl_runner.CWL_LOGS_POLL_MIN_INTERVAL", 1)
+@patch("reana_client.cli.cwl_runner.sleep")
+def test_wait_for_workflow_logs(mock_sleep):
+    """Test polling the logs with backoff until the end marker is found."""
+    step_logs = _server_logs("Running step 1\n", {})
+    logs = [
+        _server_logs("", {}),
+        step_logs,
+        step_logs,
+        step_logs,
+        step_logs,
+        step_logs,
+        # the end marker is split between two polls
+        _server_logs("Running step 1\nFinal pro", {}),
+        _server_logs("Running step 1\nFinal process status is success\n", {}),
+    ]
+    with patch(
+        "reana_client.api.client.get_workflow_logs",
+        side_effect=[{"logs": poll_logs} for poll_logs in logs],
+    ) as mock_get_workflow_logs:
+        assert wait_for_workflow_logs("workflow-id", "token") == logs[-1]
+    assert mock_get_workflow_logs.call_count == len(logs)
+    # the interval doubles, up to the maximum, while no new logs are produced,
+    # and is reset to the minimum as soon as new logs arrive
+    assert mock_sleep.call_args_list == [
+        call(interval) for interval in [1, 1, 1, 2, 4, 8, 15, 1]
+    ]
+
+
+@patch("reana_client.cli.cwl_runner.sleep")
+def test_wait_for_workflow_logs_end_marker_before_job_logs(mock_sleep):
+    """Test finding the end marker added to the workflow logs before the job logs."""
+    job_logs = {
+        "job-{}".format(i): {"logs": "Job output line\n" * 100} for i in range(10)
+    }
+    logs = [
+        _server_logs("Running step 1\n", {}),
+        _server_logs("Running step 1\n", job_logs),
+        _server_logs("Running step 1\nFinal process status is success\n", job_logs),
+    ]
+    with patch(
+        "reana_client.api.client.get_workflow_logs",
+        side_effect=[{"logs": poll_logs} for poll_logs in logs],
+    ) as mock_get_workflow_logs:
+        assert wait_for_workflow_logs("workflow-id", "token") == logs[-1]
+    assert mock_get_workflow_logs.call_count == len(logs)
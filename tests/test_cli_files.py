@@ -12,8 +12,12 @@ import hashlib
 import io
 import json
 import os
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
+import pytest
+import requests
 from click.testing import CliRunner
 from mock import Mock, patch
 from pytest_reana.test_utils import make_mock_api_client
@@ -113,7 +117,7 @@ def test_download_file():
     file = "dummy_file.txt"
     mock_http_response = Mock()
     mock_http_response.status_code = status_code
-    mock_http_response.content = str(response).encode()
+    mock_http_response.iter_content = Mock(return_value=[str(response).encode()])
     mock_http_response.headers = {
         "Content-Disposition": "attachment; filename={}".format(file),
         "Content-Type": "multipart/form-data",
@@ -126,7 +130,7 @@ def test_download_file():
     message = "File {0} downloaded to".format(file)
     runner = CliRunner(env=env)
     with runner.isolation():
-        with patch("reana_client.api.client.requests", mock_requests):
+        with patch("reana_client.api.client.http_session", mock_requests):
             result = runner.invoke(
                 cli, ["download", "-t", reana_token, "--workflow", "mytest.1", file]
             )
@@ -135,9 +139,55 @@ def test_download_file():
             file_md5 = hashlib.md5(open(file, "rb").read()).hexdigest()
             assert file_md5 == response_md5
             assert message in result.output
+            mock_http_response.close.assert_called_once()
             os.remove(file)
 
 
+def test_download_file_interrupted(tmp_path):
+    """Test that an interrupted download leaves no partial file behind."""
+    env = {"REANA_SERVER_URL": "localhost"}
+    file = "dummy_file.txt"
+
+    def iter_content(chunk_size):
+        yield b"Partial content"
+        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    mock_http_response = Mock()
+    mock_http_response.status_code = 200
+    mock_http_response.iter_content = iter_content
+    mock_http_response.headers = {
+        "Content-Disposition": "attachment; filename={}".format(file),
+        "Content-Type": "multipart/form-data",
+    }
+    mock_requests = Mock()
+    mock_requests.get = Mock(return_value=mock_http_response)
+
+    reana_token = "000000"
+    runner = CliRunner(env=env)
+    with runner.isolation():
+        with patch("reana_client.api.client.http_session", mock_requests):
+            result = runner.invoke(
+                cli,
+                [
+                    "download",
+                    "-t",
+                    reana_token,
+                    "--workflow",
+                    "mytest.1",
+                    file,
+                    "-o",
+                    str(tmp_path),
+                ],
+            )
+            assert result.exit_code == 1
+            assert (
+                "File {} could not be downloaded: Connection broken".format(file)
+                in result.output
+            )
+            assert os.listdir(tmp_path) == []
+            mock_http_response.close.assert_called_once()
+
+
 def test_download_file_stdout():
     """Test writing a single file to stdout."""
     env = {"REANA_SERVER_URL": "localhost"}
@@ -156,7 +206,7 @@ def test_download_file_stdout():
     reana_token = "000000"
     runner = CliRunner(env=env)
     with runner.isolation():
-        with patch("reana_client.api.client.requests", mock_requests):
+        with patch("reana_client.api.client.http_session", mock_requests):
             result = runner.invoke(
                 cli,
                 [
@@ -172,6 +222,7 @@ def test_download_file_stdout():
             )
             assert result.exit_code == 0
             assert result.output == file_content
+            mock_http_response.close.assert_called_once()
 
 
 def test_download_multiple_files_stdout():
@@ -200,7 +251,7 @@ def test_download_multiple_files_stdout():
     reana_token = "000000"
     runner = CliRunner(env=env)
     with runner.isolation():
-        with patch("reana_client.api.client.requests", mock_requests):
+        with patch("reana_client.api.client.http_session", mock_requests):
             result = runner.invoke(
                 cli,
                 [
@@ -226,7 +277,7 @@ def test_upload_file(create_yaml_workflow_schema):
     message = "was successfully uploaded."
     runner = CliRunner(env=env)
     with runner.isolation():
-        with patch("reana_client.api.client.requests.post") as post_request:
+        with patch("reana_client.api.client.http_session.post") as post_request:
             with runner.isolated_filesystem():
                 with open(file, "w") as f:
                     f.write("test")
@@ -240,6 +291,36 @@ def test_upload_file(create_yaml_workflow_schema):
                 assert message in result.output
 
 
+def test_upload_file_vanished():
+    """Test uploading a file which disappears before being uploaded."""
+    reana_token = "000000"
+    file = "file.txt"
+    vanished_file = os.path.join("data", "vanished.txt")
+    env = {"REANA_SERVER_URL": "http://localhost"}
+    runner = CliRunner(env=env)
+    with runner.isolation():
+        with patch("reana_client.api.client.http_session.post") as post_request:
+            with runner.isolated_filesystem():
+                with open(file, "w") as f:
+                    f.write("test")
+                os.mkdir("data")
+                with patch(
+                    "reana_client.cli.files.os.walk",
+                    return_value=[("data", [], ["vanished.txt"])],
+                ):
+                    result = runner.invoke(
+                        cli,
+                        ["upload", "-t", reana_token, "-w", "mytest.1", file, "data"],
+                    )
+                post_request.assert_called_once()
+                assert result.exit_code == 1
+                assert "was successfully uploaded." in result.output
+                assert (
+                    f"File {vanished_file} could not be uploaded: "
+                    f"{vanished_file} does not exist." in result.output
+                )
+
+
 def test_upload_file_with_test_files_from_spec(
     get_workflow_specification_with_directory,
 ):
@@ -251,7 +332,7 @@ def test_upload_file_with_test_files_from_spec(
 
     with patch(
         "reana_client.api.client.get_workflow_specification"
-    ) as mock_specification, patch("reana_client.api.client.requests.post"):
+    ) as mock_specification, patch("reana_client.api.client.http_session.post"):
         with runner.isolated_filesystem():
             with open(file, "w") as f:
                 f.write("Scenario: Test scenario")
@@ -280,7 +361,7 @@ def test_upload_file_respect_gitignore(
     with runner.isolation():
         with patch(
             "reana_client.api.client.get_workflow_specification", mock_specification
-        ), patch("reana_client.api.client.requests.post") as post_request:
+        ), patch("reana_client.api.client.http_session.post") as post_request:
             with runner.isolated_filesystem():
                 with open(".gitignore", "w") as f:
                     f.write("data/should_not_upload.txt\n")
@@ -315,7 +396,7 @@ def test_upload_file_skip_empty_git_and_reana_ignore_files(
     with runner.isolation():
         with patch(
             "reana_client.api.client.get_workflow_specification", mock_specification
-        ), patch("reana_client.api.client.requests.post") as post_request:
+        ), patch("reana_client.api.client.http_session.post") as post_request:
             with runner.isolated_filesystem():
                 with open(".gitignore", "w") as f:
                     f.write("\n")
@@ -355,7 +436,7 @@ def test_upload_file_respect_reanaignore_and_gitignore(
     with runner.isolation():
         with patch(
             "reana_client.api.client.get_workflow_specification", mock_specification
-        ), patch("reana_client.api.client.requests.post"):
+        ), patch("reana_client.api.client.http_session.post"):
             with runner.isolated_filesystem():
                 with open(".gitignore", "w") as f:
                     f.write("data/ignored_in_gitignore.txt\n")
@@ -455,6 +536,78 @@ def test_delete_non_existing_file():
                 assert message in result.output
 
 
+def test_delete_files_concurrently():
+    """Test deleting files whose deletions finish in a different order."""
+    reana_token = "000000"
+    filenames = ["file1", "file2", "file3", "file4"]
+    file_deleted = {filename: threading.Event() for filename in filenames}
+
+    def delete_file(workflow, filename, access_token):
+        # deletions finish in the reverse order in which they are requested
+        for other in filenames[filenames.index(filename) + 1 :]:
+            file_deleted[other].wait(timeout=5)
+        file_deleted[filename].set()
+        if filename == "file3":
+            raise Exception("Connection reset.")
+        return {"deleted": {filename: {"size": 1}}, "failed": {}}
+
+    env = {"REANA_SERVER_URL": "localhost"}
+    runner = CliRunner(env=env)
+    with runner.isolation():
+        with patch(
+            "reana_client.api.client.delete_file", side_effect=delete_file
+        ) as mock_delete_file:
+            result = runner.invoke(
+                cli, ["rm", "-t", reana_token, "--workflow", "mytest.1"] + filenames
+            )
+    assert mock_delete_file.call_count == len(filenames)
+    assert result.exit_code == 1
+    messages = [
+        "File file1 was successfully deleted.",
+        "File file2 was successfully deleted.",
+        "Something went wrong while deleting file3",
+        "File file4 was successfully deleted.",
+    ]
+    positions = [result.output.find(message) for message in messages]
+    assert -1 not in positions
+    assert positions == sorted(positions)
+
+
+@pytest.mark.parametrize(
+    "filenames",
+    [
+        ["data/*", "data/a.txt"],
+        ["data", "data/a.txt"],
+        ["data/a.txt", "./data/a.txt"],
+    ],
+)
+def test_delete_overlapping_files(filenames):
+    """Test deleting patterns that match the same files one after the other."""
+    reana_token = "000000"
+    deleted_files = set()
+
+    def delete_file(workflow, filename, access_token):
+        response = {"deleted": {}, "failed": {}}
+        if "data/a.txt" not in deleted_files:
+            deleted_files.add("data/a.txt")
+            response["deleted"]["data/a.txt"] = {"size": 1}
+        return response
+
+    env = {"REANA_SERVER_URL": "localhost"}
+    runner = CliRunner(env=env)
+    with runner.isolation():
+        with patch(
+            "reana_client.cli.files.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as mock_executor:
+            with patch("reana_client.api.client.delete_file", side_effect=delete_file):
+                result = runner.invoke(
+                    cli, ["rm", "-t", reana_token, "--workflow", "mytest.1"] + filenames
+                )
+    mock_executor.assert_called_once_with(max_workers=1)
+    assert result.exit_code == 0
+    assert result.output.count("File data/a.txt was successfully deleted.") == 1
+
+
 def test_move_files():
     """Test move files."""
     reana_token = "000000"
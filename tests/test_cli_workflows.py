@@ -667,7 +667,7 @@ def test_workflow_create_successful(create_yaml_workflow_schema):
         with patch(
             "reana_client.api.client.current_rs_api_client",
             make_mock_api_client("reana-server")(mock_response, mock_http_response),
-        ), patch("reana_client.api.client.requests.post") as upload_request:
+        ), patch("reana_client.api.client.http_session.post") as upload_request:
             with runner.isolated_filesystem():
                 with open("reana.yaml", "w") as f:
                     f.write(create_yaml_workflow_schema)